@@ -1,9 +1,13 @@
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 import pandas as pd
 import numpy as np
-from plotly.subplots import make_subplots
+from dataclasses import dataclass
+from types import MappingProxyType
+
+# Serialize figures for the frontend with orjson (native numpy support) instead of json
+pio.json.config.default_engine = "orjson"
 
 # Set page config
 st.set_page_config(
@@ -25,274 +29,468 @@ why current sectoral approaches are fundamentally inadequate for industry realit
 """)
 
 # Industry data based on actual CDP research with real IPCC cost ranges
-industry_data = {
-    'Food, Beverage & Tobacco': {
-        'scope3_total_emissions': 67,  # % of total emissions that are Scope 3
-        'sector_dependencies': {
-            'AFOLU': {'percentage': 40, 'guidance': 'Available', 'cost_range': '$0-50/tCO2e', 'scope3_category': 'C1: Purchased goods (agricultural)', 'color': '#2E7D32'},
-            'Industry': {'percentage': 20, 'guidance': 'Limited', 'cost_range': '$20-100/tCO2e', 'scope3_category': 'C1: Purchased goods (packaging)', 'color': '#FF5722'},
-            'Transport': {'percentage': 15, 'guidance': 'Generic only', 'cost_range': '$0-50/tCO2e', 'scope3_category': 'C4+C9: Transport', 'color': '#FF9800'},
-            'Buildings': {'percentage': 10, 'guidance': 'None', 'cost_range': '$20-100/tCO2e', 'scope3_category': 'C13: Retail/storage', 'color': '#F44336'},
-            'Power': {'percentage': 15, 'guidance': 'Available', 'cost_range': '$0-20/tCO2e', 'scope3_category': 'C2: Processing facilities', 'color': '#2E7D32'}
-        },
-        'key_challenge': 'Even with FLAG guidance, 60% of F&B emissions lack industry-specific pathways',
-        'cdp_sample_size': 162,
-        'main_gap': 'No methodology for packaging, retail, and processing dependencies'
-    },
-    'Transport OEMs': {
-        'scope3_total_emissions': 84,
-        'sector_dependencies': {
-            'Industry': {'percentage': 11, 'guidance': 'Generic only', 'cost_range': '$20-100/tCO2e', 'scope3_category': 'C1: Manufacturing', 'color': '#FF9800'},
-            'Transport': {'percentage': 86, 'guidance': 'Recent (2024)', 'cost_range': '$0-50/tCO2e', 'scope3_category': 'C11: Use phase', 'color': '#4CAF50'},
-            'Power': {'percentage': 3, 'guidance': 'Available', 'cost_range': '$0-20/tCO2e', 'scope3_category': 'C2: Manufacturing facilities', 'color': '#2E7D32'}
+@st.cache_data(ttl=None, show_spinner=False)
+def _load_industry_data():
+    return {
+        'Food, Beverage & Tobacco': {
+            'scope3_total_emissions': 67,  # % of total emissions that are Scope 3
+            'sector_dependencies': {
+                'AFOLU': {'percentage': 40, 'guidance': 'Available', 'cost_range': '$0-50/tCO2e', 'cost_min': 0, 'cost_max': 50, 'scope3_category': 'C1: Purchased goods (agricultural)', 'color': '#2E7D32'},
+                'Industry': {'percentage': 20, 'guidance': 'Limited', 'cost_range': '$20-100/tCO2e', 'cost_min': 20, 'cost_max': 100, 'scope3_category': 'C1: Purchased goods (packaging)', 'color': '#FF5722'},
+                'Transport': {'percentage': 15, 'guidance': 'Generic only', 'cost_range': '$0-50/tCO2e', 'cost_min': 0, 'cost_max': 50, 'scope3_category': 'C4+C9: Transport', 'color': '#FF9800'},
+                'Buildings': {'percentage': 10, 'guidance': 'None', 'cost_range': '$20-100/tCO2e', 'cost_min': 20, 'cost_max': 100, 'scope3_category': 'C13: Retail/storage', 'color': '#F44336'},
+                'Power': {'percentage': 15, 'guidance': 'Available', 'cost_range': '$0-20/tCO2e', 'cost_min': 0, 'cost_max': 20, 'scope3_category': 'C2: Processing facilities', 'color': '#2E7D32'}
+            },
+            'key_challenge': 'Even with FLAG guidance, 60% of F&B emissions lack industry-specific pathways',
+            'cdp_sample_size': 162,
+            'main_gap': 'No methodology for packaging, retail, and processing dependencies'
         },
-        'key_challenge': 'New Land Transport guidance covers use-phase, but manufacturing gaps remain',
-        'cdp_sample_size': 48,
-        'main_gap': 'No methodology linking automotive supply chain complexity to science-based targets'
-    },
-    'Capital Goods': {
-        'scope3_total_emissions': 90,
-        'sector_dependencies': {
-            'Industry': {'percentage': 6, 'guidance': 'Generic only', 'cost_range': '$20-100/tCO2e', 'scope3_category': 'C1: Manufacturing', 'color': '#FF9800'},
-            'Multiple_Enduse': {'percentage': 91, 'guidance': 'None', 'cost_range': '$50-200/tCO2e', 'scope3_category': 'C11: Use across all sectors', 'color': '#F44336'},
-            'Power': {'percentage': 3, 'guidance': 'Available', 'cost_range': '$0-20/tCO2e', 'scope3_category': 'C2: Manufacturing', 'color': '#2E7D32'}
+        'Transport OEMs': {
+            'scope3_total_emissions': 84,
+            'sector_dependencies': {
+                'Industry': {'percentage': 11, 'guidance': 'Generic only', 'cost_range': '$20-100/tCO2e', 'cost_min': 20, 'cost_max': 100, 'scope3_category': 'C1: Manufacturing', 'color': '#FF9800'},
+                'Transport': {'percentage': 86, 'guidance': 'Recent (2024)', 'cost_range': '$0-50/tCO2e', 'cost_min': 0, 'cost_max': 50, 'scope3_category': 'C11: Use phase', 'color': '#4CAF50'},
+                'Power': {'percentage': 3, 'guidance': 'Available', 'cost_range': '$0-20/tCO2e', 'cost_min': 0, 'cost_max': 20, 'scope3_category': 'C2: Manufacturing facilities', 'color': '#2E7D32'}
+            },
+            'key_challenge': 'New Land Transport guidance covers use-phase, but manufacturing gaps remain',
+            'cdp_sample_size': 48,
+            'main_gap': 'No methodology linking automotive supply chain complexity to science-based targets'
         },
-        'key_challenge': '91% of emissions have no methodology to link equipment efficiency to sectoral pathways',
-        'cdp_sample_size': 166,
-        'main_gap': 'No framework for translating product improvements into science-based targets'
-    },
-    'Financial Services': {
-        'scope3_total_emissions': 99.98,  # Extreme Scope 3 dominance
-        'sector_dependencies': {
-            'All_Sectors_via_Investments': {'percentage': 99, 'guidance': 'PCAF available', 'cost_range': 'Variable by sector', 'scope3_category': 'C15: Financed emissions', 'color': '#9C27B0'},
-            'Buildings': {'percentage': 1, 'guidance': 'Available', 'cost_range': '$0-50/tCO2e', 'scope3_category': 'C13: Real estate portfolio', 'color': '#2E7D32'}
+        'Capital Goods': {
+            'scope3_total_emissions': 90,
+            'sector_dependencies': {
+                'Industry': {'percentage': 6, 'guidance': 'Generic only', 'cost_range': '$20-100/tCO2e', 'cost_min': 20, 'cost_max': 100, 'scope3_category': 'C1: Manufacturing', 'color': '#FF9800'},
+                'Multiple_Enduse': {'percentage': 91, 'guidance': 'None', 'cost_range': '$50-200/tCO2e', 'cost_min': 50, 'cost_max': 200, 'scope3_category': 'C11: Use across all sectors', 'color': '#F44336'},
+                'Power': {'percentage': 3, 'guidance': 'Available', 'cost_range': '$0-20/tCO2e', 'cost_min': 0, 'cost_max': 20, 'scope3_category': 'C2: Manufacturing', 'color': '#2E7D32'}
+            },
+            'key_challenge': '91% of emissions have no methodology to link equipment efficiency to sectoral pathways',
+            'cdp_sample_size': 166,
+            'main_gap': 'No framework for translating product improvements into science-based targets'
         },
-        'key_challenge': 'Portfolio emissions span ALL sectors but no methodology links PCAF to sectoral pathways',
-        'cdp_sample_size': 377,
-        'main_gap': 'Financed emissions 700x larger than direct, but sectoral investment optimization lacks science-based framework'
-    },
-    'Chemicals': {
-        'scope3_total_emissions': 44,
-        'sector_dependencies': {
-            'Industry': {'percentage': 58, 'guidance': 'Limited', 'cost_range': '$20-100/tCO2e', 'scope3_category': 'C1: Raw materials', 'color': '#FF5722'},
-            'Multiple_Downstream': {'percentage': 19, 'guidance': 'None', 'cost_range': '$50-200/tCO2e', 'scope3_category': 'C11: Use in other industries', 'color': '#F44336'},
-            'Transport': {'percentage': 12, 'guidance': 'Generic only', 'cost_range': '$0-50/tCO2e', 'scope3_category': 'C4+C9: Transport', 'color': '#FF9800'},
-            'Power': {'percentage': 8, 'guidance': 'Available', 'cost_range': '$0-20/tCO2e', 'scope3_category': 'C2: Production facilities', 'color': '#2E7D32'},
-            'Buildings': {'percentage': 3, 'guidance': 'Limited', 'cost_range': '$100-200/tCO2e', 'scope3_category': 'C12: End-of-life', 'color': '#FF5722'}
+        'Financial Services': {
+            'scope3_total_emissions': 99.98,  # Extreme Scope 3 dominance
+            'sector_dependencies': {
+                'All_Sectors_via_Investments': {'percentage': 99, 'guidance': 'PCAF available', 'cost_range': 'Variable by sector', 'cost_min': 20, 'cost_max': 100, 'scope3_category': 'C15: Financed emissions', 'color': '#9C27B0'},  # cost bounds default to $20-100 where IPCC gives no range
+                'Buildings': {'percentage': 1, 'guidance': 'Available', 'cost_range': '$0-50/tCO2e', 'cost_min': 0, 'cost_max': 50, 'scope3_category': 'C13: Real estate portfolio', 'color': '#2E7D32'}
+            },
+            'key_challenge': 'Portfolio emissions span ALL sectors but no methodology links PCAF to sectoral pathways',
+            'cdp_sample_size': 377,
+            'main_gap': 'Financed emissions 700x larger than direct, but sectoral investment optimization lacks science-based framework'
         },
-        'key_challenge': 'Intermediate products create unknown downstream use-phase across multiple industries',
-        'cdp_sample_size': 146,
-        'main_gap': 'No methodology for tracking chemical products through complex multi-industry value chains'
+        'Chemicals': {
+            'scope3_total_emissions': 44,
+            'sector_dependencies': {
+                'Industry': {'percentage': 58, 'guidance': 'Limited', 'cost_range': '$20-100/tCO2e', 'cost_min': 20, 'cost_max': 100, 'scope3_category': 'C1: Raw materials', 'color': '#FF5722'},
+                'Multiple_Downstream': {'percentage': 19, 'guidance': 'None', 'cost_range': '$50-200/tCO2e', 'cost_min': 50, 'cost_max': 200, 'scope3_category': 'C11: Use in other industries', 'color': '#F44336'},
+                'Transport': {'percentage': 12, 'guidance': 'Generic only', 'cost_range': '$0-50/tCO2e', 'cost_min': 0, 'cost_max': 50, 'scope3_category': 'C4+C9: Transport', 'color': '#FF9800'},
+                'Power': {'percentage': 8, 'guidance': 'Available', 'cost_range': '$0-20/tCO2e', 'cost_min': 0, 'cost_max': 20, 'scope3_category': 'C2: Production facilities', 'color': '#2E7D32'},
+                'Buildings': {'percentage': 3, 'guidance': 'Limited', 'cost_range': '$100-200/tCO2e', 'cost_min': 100, 'cost_max': 200, 'scope3_category': 'C12: End-of-life', 'color': '#FF5722'}
+            },
+            'key_challenge': 'Intermediate products create unknown downstream use-phase across multiple industries',
+            'cdp_sample_size': 146,
+            'main_gap': 'No methodology for tracking chemical products through complex multi-industry value chains'
+        }
     }
-}
 
 # IPCC sectoral cost data (from AR6 WGIII Chapter 12, Table 12.3)
-ipcc_cost_data = {
-    'AFOLU': {
-        'description': 'Agriculture, Forestry, Other Land Use',
-        'cost_ranges': {
-            'Forest protection': '$0-20/tCO2e',
-            'Soil carbon sequestration': '$20-50/tCO2e',
-            'Agricultural CH4/N2O reduction': '$20-50/tCO2e',
-            'Restoration': '$50-100/tCO2e'
+@st.cache_data(ttl=None, show_spinner=False)
+def _load_ipcc_cost_data():
+    return {
+        'AFOLU': {
+            'description': 'Agriculture, Forestry, Other Land Use',
+            'cost_ranges': {
+                'Forest protection': '$0-20/tCO2e',
+                'Soil carbon sequestration': '$20-50/tCO2e',
+                'Agricultural CH4/N2O reduction': '$20-50/tCO2e',
+                'Restoration': '$50-100/tCO2e'
+            },
+            'total_potential': '11.4 GtCO2-eq by 2030',
+            'potential_gt': 11.4
         },
-        'total_potential': '11.4 GtCO2-eq by 2030'
-    },
-    'Industry': {
-        'description': 'Manufacturing, Processing, Materials',
-        'cost_ranges': {
-            'Energy efficiency': '$0-20/tCO2e',
-            'Material efficiency': '$20-50/tCO2e',
-            'Fuel switching': '$20-100/tCO2e',
-            'CCS': '$100-200/tCO2e'
+        'Industry': {
+            'description': 'Manufacturing, Processing, Materials',
+            'cost_ranges': {
+                'Energy efficiency': '$0-20/tCO2e',
+                'Material efficiency': '$20-50/tCO2e',
+                'Fuel switching': '$20-100/tCO2e',
+                'CCS': '$100-200/tCO2e'
+            },
+            'total_potential': '5.4 GtCO2-eq by 2030',
+            'potential_gt': 5.4
         },
-        'total_potential': '5.4 GtCO2-eq by 2030'
-    },
-    'Transport': {
-        'description': 'Logistics, Distribution, Mobility',
-        'cost_ranges': {
-            'Fuel efficiency': '$0-20/tCO2e',
-            'Electric vehicles': 'Variable costs',
-            'Modal shift': '$0-50/tCO2e',
-            'Biofuels': '$50-100/tCO2e'
+        'Transport': {
+            'description': 'Logistics, Distribution, Mobility',
+            'cost_ranges': {
+                'Fuel efficiency': '$0-20/tCO2e',
+                'Electric vehicles': 'Variable costs',
+                'Modal shift': '$0-50/tCO2e',
+                'Biofuels': '$50-100/tCO2e'
+            },
+            'total_potential': '3.8 GtCO2-eq by 2030',
+            'potential_gt': 3.8
         },
-        'total_potential': '3.8 GtCO2-eq by 2030'
-    },
-    'Buildings': {
-        'description': 'Retail, Storage, Facilities',
-        'cost_ranges': {
-            'Energy efficiency': '$0-20/tCO2e',
-            'Building performance': '$20-100/tCO2e',
-            'Onsite renewables': '$20-50/tCO2e'
+        'Buildings': {
+            'description': 'Retail, Storage, Facilities',
+            'cost_ranges': {
+                'Energy efficiency': '$0-20/tCO2e',
+                'Building performance': '$20-100/tCO2e',
+                'Onsite renewables': '$20-50/tCO2e'
+            },
+            'total_potential': '2.0 GtCO2-eq by 2030',
+            'potential_gt': 2.0
         },
-        'total_potential': '2.0 GtCO2-eq by 2030'
-    },
-    'Power': {
-        'description': 'Electricity Generation',
-        'cost_ranges': {
-            'Wind energy': 'Mostly <$0/tCO2e',
-            'Solar energy': 'Mostly <$0/tCO2e',
-            'Nuclear': '$0-50/tCO2e',
-            'Hydropower': '$0-50/tCO2e'
-        },
-        'total_potential': '11.0 GtCO2-eq by 2030'
+        'Power': {
+            'description': 'Electricity Generation',
+            'cost_ranges': {
+                'Wind energy': 'Mostly <$0/tCO2e',
+                'Solar energy': 'Mostly <$0/tCO2e',
+                'Nuclear': '$0-50/tCO2e',
+                'Hydropower': '$0-50/tCO2e'
+            },
+            'total_potential': '11.0 GtCO2-eq by 2030',
+            'potential_gt': 11.0
+        }
     }
+
+# SBTi guidance label -> status shown in the guidance table
+GUIDANCE_STATUS = {
+    'Available': '✅',
+    'Recent (2024)': '⚠️',
+    'Generic only': '⚠️',
+    'Limited': '❌',
+    'None': '❌',
+    'PCAF available': '❌'  # not counted as industry-specific coverage either
 }
 
-# Sidebar for industry selection
-st.sidebar.header("🏭 Select Industry for Analysis")
-selected_industry = st.sidebar.selectbox(
-    "Choose an industry to explore its cross-sectoral dependencies:",
-    list(industry_data.keys()),
-    help="Based on CDP's analysis of corporate disclosures and SBTi guidance coverage"
-)
+# Immutable records for the industry catalog
+@dataclass(frozen=True)
+class SectorDep:
+    percentage: int
+    guidance: str
+    cost_range: str
+    cost_min: int
+    cost_max: int
+    scope3_category: str
+    color: str
+    status: str
+
+@dataclass(frozen=True)
+class IndustryRecord:
+    scope3_total_emissions: float
+    sector_dependencies: MappingProxyType  # sector name -> SectorDep
+    key_challenge: str
+    cdp_sample_size: int
+    main_gap: str
+    coverage: int  # % of Scope 3 with available guidance
+    gap: int
+
+# Built once per process and shared by identity across sessions and reruns
+@st.cache_resource(show_spinner=False)
+def catalog():
+    records = {}
+    for name, d in _load_industry_data().items():
+        deps = MappingProxyType({
+            sector: SectorDep(**details, status=GUIDANCE_STATUS[details['guidance']])
+            for sector, details in d['sector_dependencies'].items()
+        })
+        coverage = sum(dep.percentage for dep in deps.values() if dep.guidance == 'Available')
+        records[name] = IndustryRecord(
+            scope3_total_emissions=d['scope3_total_emissions'],
+            sector_dependencies=deps,
+            key_challenge=d['key_challenge'],
+            cdp_sample_size=d['cdp_sample_size'],
+            main_gap=d['main_gap'],
+            coverage=coverage,
+            gap=100 - coverage
+        )
+    return MappingProxyType(records)
+
+@st.cache_data(ttl=None, show_spinner=False)
+def _industry_names():
+    return list(catalog().keys())
+
+# Semi-transparent Sankey link colors, converted once for every hex color in the catalog
+@st.cache_resource(show_spinner=False)
+def hex2rgba():
+    palette = {dep.color for record in catalog().values() for dep in record.sector_dependencies.values()}
+    return MappingProxyType({
+        h: f"rgba({int(h[1:3], 16)}, {int(h[3:5], 16)}, {int(h[5:7], 16)}, 0.7)"
+        for h in palette
+    })
 
-# Main dashboard layout
-col1, col2 = st.columns([3, 2])
+# Long-form (one row per industry/sector pair) view of the sector dependencies,
+# so per-industry quantities are column operations rather than dict loops
+@st.cache_data(show_spinner=False)
+def build_deps_df() -> pd.DataFrame:
+    records = [
+        (industry, sector, dep.percentage, dep.guidance, dep.cost_range,
+         dep.cost_min, dep.cost_max, dep.scope3_category, dep.color, dep.status)
+        for industry, record in catalog().items()
+        for sector, dep in record.sector_dependencies.items()
+    ]
+    deps_df = pd.DataFrame.from_records(
+        records,
+        columns=['industry', 'sector', 'percentage', 'guidance', 'cost_range',
+                 'cost_min', 'cost_max', 'scope3_category', 'color', 'status']
+    )
+    # Percentages are bounded by 100; cost bounds stay plain ints
+    return deps_df.astype({'percentage': np.uint8})
 
-with col1:
-    st.subheader(f"📊 Cross-Sectoral Dependencies: {selected_industry}")
+def _industry_deps(industry: str) -> pd.DataFrame:
+    deps_df = build_deps_df()
+    return deps_df[deps_df.industry == industry].reset_index(drop=True)
+
+# Trace builders for the combined dependency figure
+def _sankey_trace(industry: str) -> go.Sankey:
+    sub = _industry_deps(industry)
+    n_sectors = len(sub)
     
-    # Create Sankey diagram
-    data = industry_data[selected_industry]
+    # Create source (IPCC sectors) and target (industry) nodes
+    all_nodes = sub['sector'].tolist() + [industry]
     
-    # Prepare data for Sankey
-    sectors = list(data['sector_dependencies'].keys())
-    industry_name = [selected_industry]
+    # Prepare links: every sector flows into the industry node
+    source_indices = np.arange(n_sectors, dtype=np.int32)
+    target_indices = np.full(n_sectors, n_sectors, dtype=np.int32)
+    values = sub['percentage'].to_numpy()
+    rgba = hex2rgba()
+    link_colors = [rgba[color] for color in sub['color']]
     
-    # Create source (IPCC sectors) and target (industry) nodes
-    all_nodes = sectors + industry_name
-    
-    # Prepare links
-    source_indices = []
-    target_indices = []
-    values = []
-    colors = []
-    hover_texts = []
-    
-    for i, (sector, details) in enumerate(data['sector_dependencies'].items()):
-        source_indices.append(i)  # sector index
-        target_indices.append(len(sectors))  # industry index
-        values.append(details['percentage'])
-        colors.append(details['color'])
-        
-        # Create hover text with detailed information
-        hover_text = f"""
-        <b>{sector} → {selected_industry}</b><br>
-        Materiality: {details['percentage']}% of Scope 3 emissions<br>
-        Scope 3 Category: {details['scope3_category']}<br>
-        SBTi Guidance: {details['guidance']}<br>
-        IPCC Cost Range: {details['cost_range']}<br>
-        <extra></extra>
-        """
-        hover_texts.append(hover_text)
+    # Per-link hover fields; Plotly.js formats them through the hovertemplate
+    hover_data = sub[['percentage', 'scope3_category', 'guidance', 'cost_range']].to_numpy()
     
     # Create Sankey diagram
-    fig_sankey = go.Figure(data=[go.Sankey(
+    return go.Sankey(
         node=dict(
             pad=15,
             thickness=20,
             line=dict(color="black", width=0.5),
             label=all_nodes,
-            color=["lightblue"] * len(sectors) + ["darkblue"]
+            color=["lightblue"] * n_sectors + ["darkblue"]
         ),
         link=dict(
             source=source_indices,
             target=target_indices,
             value=values,
-            color=[f"rgba{tuple(list(px.colors.hex_to_rgb(color)) + [0.7])}" for color in colors],
-            hovertemplate='%{customdata}<extra></extra>',
-            customdata=hover_texts
-        )
-    )])
-    
-    fig_sankey.update_layout(
-        title=f"Cross-Sectoral Dependencies (CDP 2021 Data)",
-        font_size=12,
-        height=400,
-        annotations=[
-            dict(
-                text="<b>Left:</b> IPCC Sectors with Pathways<br><b>Right:</b> Industry Reality<br><b>Flows:</b> Actual CDP Materiality Data",
-                showarrow=False,
-                x=0.5, y=-0.1,
-                xref="paper", yref="paper",
-                font=dict(size=10)
+            color=link_colors,
+            customdata=hover_data,
+            hovertemplate=(
+                "<b>%{source.label} → %{target.label}</b><br>"
+                "Materiality: %{customdata[0]}% of Scope 3 emissions<br>"
+                "Scope 3 Category: %{customdata[1]}<br>"
+                "SBTi Guidance: %{customdata[2]}<br>"
+                "IPCC Cost Range: %{customdata[3]}<br>"
+                "<extra></extra>"
             )
-        ]
+        )
     )
-    
-    st.plotly_chart(fig_sankey, use_container_width=True)
-    
-    # Guidance coverage summary
-    st.markdown("### 📋 Guidance Coverage Analysis")
-    
-    guidance_summary = []
-    for sector, details in data['sector_dependencies'].items():
-        guidance_summary.append({
-            'IPCC Sector': sector,
-            'Materiality (% Scope 3)': f"{details['percentage']}%",
-            'SBTi Guidance': details['guidance'],
-            'IPCC Cost Range': details['cost_range'],
-            'Status': '✅' if details['guidance'] == 'Available' else '⚠️' if 'Generic' in details['guidance'] or 'Recent' in details['guidance'] else '❌'
-        })
-    
-    guidance_df = pd.DataFrame(guidance_summary)
-    st.dataframe(guidance_df, use_container_width=True, hide_index=True)
 
-with col2:
-    st.subheader("🎯 The Guidance Inadequacy Problem")
-    
-    # Calculate guidance gaps
-    total_coverage = sum([
-        details['percentage'] for sector, details in data['sector_dependencies'].items() 
-        if details['guidance'] == 'Available'
-    ])
-    
-    gap_coverage = 100 - total_coverage
+def _coverage_pie_trace(industry: str) -> go.Pie:
+    record = catalog()[industry]
     
     # Create pie chart showing guidance gaps
-    coverage_data = pd.DataFrame({
-        'Category': ['Has Industry-Specific Guidance', 'Guidance Gap'],
-        'Percentage': [total_coverage, gap_coverage],
-        'Color': ['#4CAF50', '#F44336']
-    })
-    
-    fig_pie = px.pie(
-        coverage_data, 
-        values='Percentage', 
-        names='Category',
-        color='Category',
-        color_discrete_map={'Has Industry-Specific Guidance': '#4CAF50', 'Guidance Gap': '#F44336'},
-        title=f"{selected_industry} Guidance Coverage"
+    return go.Pie(
+        labels=['Has Industry-Specific Guidance', 'Guidance Gap'],
+        values=np.array([record.coverage, record.gap], dtype=np.uint8),
+        marker_colors=['#4CAF50', '#F44336'],
+        textposition='inside',
+        textinfo='percent+label'
     )
-    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-    fig_pie.update_layout(height=300, showlegend=False)
-    
-    st.plotly_chart(fig_pie, use_container_width=True)
-    
-    # Key insights
-    st.markdown(f"""
-    **Key Challenge:**
-    {data['key_challenge']}
-    
-    **Sample Size:** {data['cdp_sample_size']} companies (CDP 2021)
-    
-    **Main Gap:** {data['main_gap']}
-    """)
 
-# IPCC Cost Analysis Section
-st.subheader("💰 IPCC AR6 Cross-Sectoral Cost Analysis")
+def _dependency_figure(industry: str) -> go.Figure:
+    from plotly.subplots import make_subplots
+    
+    # Sankey and coverage pie share one figure, so the page bootstraps one Plotly.js plot
+    fig = make_subplots(
+        rows=1, cols=2,
+        column_widths=[0.6, 0.4],
+        specs=[[{'type': 'sankey'}, {'type': 'domain'}]],
+        subplot_titles=(
+            "Cross-Sectoral Dependencies (CDP 2021 Data)",
+            f"{industry} Guidance Coverage"
+        )
+    )
+    fig.add_trace(_sankey_trace(industry), row=1, col=1)
+    fig.add_trace(_coverage_pie_trace(industry), row=1, col=2)
+    
+    fig.add_annotation(
+        text="<b>Left:</b> IPCC Sectors with Pathways<br><b>Right:</b> Industry Reality<br><b>Flows:</b> Actual CDP Materiality Data",
+        showarrow=False,
+        x=0.3, y=-0.1,
+        xref="paper", yref="paper",
+        font=dict(size=10)
+    )
+    fig.update_layout(font_size=12, height=450, showlegend=False)
+    return fig
+
+# Figure builders, keyed on the industry name so reruns reuse the cached figure.
+# There are only a handful of industries, so every dependency figure is built up
+# front and shared read-only (st.plotly_chart serializes a copy of each figure)
+@st.cache_resource(show_spinner=False)
+def build_dependency_figures() -> dict:
+    return {name: _dependency_figure(name) for name in catalog()}
+
+@st.cache_data(show_spinner=False)
+def build_potential_chart() -> go.Figure:
+    ipcc_cost_data = _load_ipcc_cost_data()
+    
+    # Sector potential visualization
+    sector_potentials = np.array([d['potential_gt'] for d in ipcc_cost_data.values()], dtype=np.float32)
+    sector_names = list(ipcc_cost_data.keys())
+    
+    # Whole figure as one plain-dict spec, validated in a single constructor pass
+    return go.Figure({
+        'data': [{
+            'type': 'bar',
+            'x': sector_potentials,
+            'y': sector_names,
+            'orientation': 'h',
+            'marker': {
+                'color': sector_potentials,
+                'colorscale': 'Viridis',
+                'colorbar': {'title': {'text': 'Potential (GtCO2-eq)'}}
+            },
+            'hovertemplate': 'IPCC Sector=%{y}<br>Potential (GtCO2-eq)=%{x}<extra></extra>'
+        }],
+        'layout': {
+            'title': {'text': "IPCC AR6 Sectoral Mitigation Potential (2030)"},
+            'xaxis': {'title': {'text': 'Potential (GtCO2-eq)'}},
+            'yaxis': {'title': {'text': 'IPCC Sector'}},
+            'height': 400,
+            'showlegend': False
+        }
+    })
 
-st.markdown("""
-**Source:** IPCC AR6 WGIII Chapter 12, Table 12.3 - "Overview of global net GHG emissions reduction potentials"
+@st.cache_data(show_spinner=False)
+def build_uncertainty_chart(industry: str) -> go.Figure:
+    sub = _industry_deps(industry)
+    n_sectors = len(sub)
+    y_pos = np.arange(n_sectors, dtype=np.float32)
+    max_cost = sub['cost_max'].to_numpy(dtype=np.float32)
+    gap = np.full(n_sectors, np.nan, dtype=np.float32)
+    
+    # Flatten every sector's range into one trace, with NaN gaps between segments:
+    # each sector contributes (min, max, NaN), built by stacking columns and raveling
+    xs = np.column_stack([sub['cost_min'].to_numpy(dtype=np.float32), max_cost, gap]).ravel()
+    ys = np.column_stack([y_pos, y_pos, gap]).ravel()
+    point_colors = np.repeat(sub['color'].to_numpy(), 3).tolist()
+    point_data = np.repeat(sub[['sector', 'percentage', 'cost_range', 'guidance']].to_numpy(), 3, axis=0)
+    point_data[2::3] = None
+    
+    # Materiality indicators just right of each range
+    label_x = max_cost + 10
+    label_y = y_pos
+    label_text = np.char.add(sub['percentage'].to_numpy().astype(str), '%').tolist()
+    
+    # Create cost uncertainty visualization as one plain-dict spec
+    return go.Figure({
+        'data': [
+            {
+                'type': 'scatter',
+                'x': xs,
+                'y': ys,
+                'mode': 'lines+markers',
+                'connectgaps': False,
+                'line': {'width': 8},
+                'marker': {'size': 12, 'color': point_colors},
+                'customdata': point_data,
+                'hovertemplate': (
+                    "<b>%{customdata[0]}</b><br>"
+                    "Materiality: %{customdata[1]}% of Scope 3<br>"
+                    "Cost Range: %{customdata[2]}<br>"
+                    "Guidance: %{customdata[3]}<br>"
+                    "<extra></extra>"
+                )
+            },
+            {
+                'type': 'scatter',
+                'x': label_x,
+                'y': label_y,
+                'mode': 'text',
+                'text': label_text,
+                'textfont': {'size': 10},
+                'hoverinfo': 'skip'
+            }
+        ],
+        'layout': {
+            'title': {'text': "Cost Uncertainty vs. Emission Materiality"},
+            'xaxis': {'title': {'text': "Cost Range ($/tCO2e)"}},
+            'yaxis': {
+                'title': {'text': "Sectoral Dependencies"},
+                'tickvals': list(range(n_sectors)),
+                'ticktext': sub['sector'].tolist()
+            },
+            'height': 400,
+            'showlegend': False
+        }
+    })
 
-The challenge isn't just missing guidance—it's cost uncertainty across value chains.
-""")
+# Table builders with explicit columns/dtypes so the frames are built once per input
+@st.cache_data(show_spinner=False)
+def build_guidance_df(industry: str) -> pd.DataFrame:
+    sub = _industry_deps(industry)
+    
+    # Column-wise construction from typed arrays: no row dicts, no dtype inference.
+    # Materiality stays numeric (uint8, formatted as % by the column config) and the
+    # low-cardinality labels are categoricals, keeping the Arrow payload small
+    arrs = {
+        'IPCC Sector': pd.array(sub['sector'].to_numpy(), dtype='string'),
+        'Materiality (% Scope 3)': sub['percentage'].to_numpy(),
+        'SBTi Guidance': pd.Categorical(sub['guidance']),
+        'IPCC Cost Range': pd.Categorical(sub['cost_range']),
+        'Status': pd.Categorical(sub['status'])
+    }
+    return pd.DataFrame(arrs, copy=False)
+
+@st.cache_data(show_spinner=False)
+def build_cost_df() -> pd.DataFrame:
+    cols = {'IPCC Sector': [], 'Intervention': [], 'Cost Range': [], 'Potential': []}
+    for sector, data in _load_ipcc_cost_data().items():
+        for intervention, cost in data['cost_ranges'].items():
+            cols['IPCC Sector'].append(sector)
+            cols['Intervention'].append(intervention)
+            cols['Cost Range'].append(cost)
+            cols['Potential'].append(data['total_potential'])
+    
+    # Column-oriented construction, all columns at once; sector and potential
+    # repeat per intervention, so they are stored as categoricals
+    return pd.DataFrame({
+        'IPCC Sector': pd.Categorical(cols['IPCC Sector']),
+        'Intervention': pd.array(cols['Intervention'], dtype='string'),
+        'Cost Range': pd.array(cols['Cost Range'], dtype='string'),
+        'Potential': pd.Categorical(cols['Potential'])
+    }, copy=False)
+
+GUIDANCE_COLUMN_CONFIG = {
+    'IPCC Sector': st.column_config.TextColumn('IPCC Sector'),
+    'Materiality (% Scope 3)': st.column_config.NumberColumn('Materiality (% Scope 3)', format='%d%%'),
+    'SBTi Guidance': st.column_config.Column('SBTi Guidance'),
+    'IPCC Cost Range': st.column_config.Column('IPCC Cost Range'),
+    'Status': st.column_config.Column('Status', width='small')
+}
 
-# Create cost comparison visualization
-cost_tab1, cost_tab2 = st.tabs(["📊 Cost Ranges by Sector", "🎮 Investment Complexity Simulator"])
+COST_COLUMN_CONFIG = {
+    'IPCC Sector': st.column_config.Column('IPCC Sector'),
+    'Intervention': st.column_config.TextColumn('Intervention'),
+    'Cost Range': st.column_config.TextColumn('Cost Range'),
+    'Potential': st.column_config.Column('Potential')
+}
 
-with cost_tab1:
+# Shared Plotly.js config for every chart on the page
+PLOTLY_CONFIG = {'staticPlot': False, 'responsive': True}
+
+# Per-session memo of the selected industry's built objects, so reruns with an
+# unchanged selection skip even the cache hash lookup
+def _industry_view(industry: str) -> dict:
+    key = f"view:{industry}"
+    if key not in st.session_state:
+        st.session_state[key] = {
+            'dependency_figure': build_dependency_figures()[industry],
+            'guidance_df': build_guidance_df(industry)
+        }
+    return st.session_state[key]
+
+# Cost analysis views, rendered one at a time from the industry fragment
+def render_cost_ranges():
     # Display IPCC cost data
     st.markdown("### IPCC AR6 Sectoral Mitigation Costs (2030)")
     
@@ -300,106 +498,39 @@ with cost_tab1:
     
     with col1:
         # Cost ranges table
-        cost_summary = []
-        for sector, data in ipcc_cost_data.items():
-            for intervention, cost in data['cost_ranges'].items():
-                cost_summary.append({
-                    'IPCC Sector': sector,
-                    'Intervention': intervention,
-                    'Cost Range': cost,
-                    'Potential': data['total_potential']
-                })
-        
-        cost_df = pd.DataFrame(cost_summary)
-        st.dataframe(cost_df, use_container_width=True, hide_index=True)
+        st.dataframe(
+            build_cost_df(),
+            use_container_width=True,
+            hide_index=True,
+            column_config=COST_COLUMN_CONFIG
+        )
     
     with col2:
-        # Sector potential visualization
-        sector_potentials = [float(data['total_potential'].split()[0]) for data in ipcc_cost_data.values()]
-        sector_names = list(ipcc_cost_data.keys())
-        
-        fig_potential = px.bar(
-            x=sector_potentials,
-            y=sector_names,
-            orientation='h',
-            title="IPCC AR6 Sectoral Mitigation Potential (2030)",
-            labels={'x': 'Potential (GtCO2-eq)', 'y': 'IPCC Sector'},
-            color=sector_potentials,
-            color_continuous_scale='Viridis'
+        st.plotly_chart(
+            build_potential_chart(),
+            use_container_width=True,
+            config=PLOTLY_CONFIG,
+            theme=None
         )
-        fig_potential.update_layout(height=400, showlegend=False)
-        st.plotly_chart(fig_potential, use_container_width=True)
 
-with cost_tab2:
+def render_simulator(industry: str, record: IndustryRecord, view: dict):
     st.markdown("### Investment Complexity Demonstration")
     
-    selected_data = industry_data[selected_industry]
+    if 'uncertainty' not in view:
+        view['uncertainty'] = build_uncertainty_chart(industry)
     
     st.markdown(f"""
-    **Scenario:** A {selected_industry} company with $10M decarbonization budget needs to optimize 
-    across {len(selected_data['sector_dependencies'])} different sectoral pathways with varying costs and uncertainties.
+    **Scenario:** A {industry} company with $10M decarbonization budget needs to optimize 
+    across {len(record.sector_dependencies)} different sectoral pathways with varying costs and uncertainties.
     """)
     
-    # Create cost uncertainty visualization
-    fig_uncertainty = go.Figure()
-    
-    y_pos = 0
-    for sector, details in selected_data['sector_dependencies'].items():
-        # Extract cost range
-        cost_range = details['cost_range']
-        materiality = details['percentage']
-        
-        # Simple cost parsing (could be enhanced)
-        if '$' in cost_range and '-' in cost_range:
-            try:
-                costs = cost_range.replace('$', '').replace('/tCO2e', '').split('-')
-                min_cost = float(costs[0])
-                max_cost = float(costs[1])
-            except:
-                min_cost, max_cost = 20, 100  # default for non-parseable ranges
-        else:
-            min_cost, max_cost = 20, 100
-        
-        # Add uncertainty bar
-        fig_uncertainty.add_trace(go.Scatter(
-            x=[min_cost, max_cost],
-            y=[y_pos, y_pos],
-            mode='lines+markers',
-            name=sector,
-            line=dict(width=8),
-            marker=dict(size=12),
-            hovertemplate=f"""
-            <b>{sector}</b><br>
-            Materiality: {materiality}% of Scope 3<br>
-            Cost Range: {cost_range}<br>
-            Guidance: {details['guidance']}<br>
-            <extra></extra>
-            """
-        ))
-        
-        # Add materiality indicator
-        fig_uncertainty.add_annotation(
-            x=max_cost + 10,
-            y=y_pos,
-            text=f"{materiality}%",
-            showarrow=False,
-            font=dict(size=10)
-        )
-        
-        y_pos += 1
-    
-    fig_uncertainty.update_layout(
-        title="Cost Uncertainty vs. Emission Materiality",
-        xaxis_title="Cost Range ($/tCO2e)",
-        yaxis_title="Sectoral Dependencies",
-        yaxis=dict(tickvals=list(range(len(selected_data['sector_dependencies']))), 
-                   ticktext=list(selected_data['sector_dependencies'].keys())),
-        height=400,
-        showlegend=False
+    st.plotly_chart(
+        view['uncertainty'],
+        use_container_width=True,
+        config=PLOTLY_CONFIG,
+        theme=None
     )
     
-    st.plotly_chart(fig_uncertainty, use_container_width=True)
-    
     st.markdown("""
     **The Investment Dilemma:**
     - Target lowest-cost options? → Miss material emission sources
@@ -407,6 +538,91 @@ with cost_tab2:
     - Current guidance provides no framework for optimization
     """)
 
+# Nested fragment: switching between the cost views reruns only this panel,
+# leaving the dependency figure and guidance table above untouched. It takes no
+# arguments and reads the selection from session state, because a fragment-only
+# rerun replays the arguments it was first registered with (streamlit 1.37)
+@st.fragment
+def render_cost_analysis():
+    industry = st.session_state.selected_industry
+    
+    # IPCC Cost Analysis Section
+    st.subheader("💰 IPCC AR6 Cross-Sectoral Cost Analysis")
+
+    st.markdown("""
+    **Source:** IPCC AR6 WGIII Chapter 12, Table 12.3 - "Overview of global net GHG emissions reduction potentials"
+
+    The challenge isn't just missing guidance—it's cost uncertainty across value chains.
+    """)
+
+    # Only the selected view is built and rendered
+    selected_tab = st.radio(
+        "View",
+        ["📊 Cost Ranges by Sector", "🎮 Investment Complexity Simulator"],
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+    if selected_tab == "📊 Cost Ranges by Sector":
+        render_cost_ranges()
+    else:
+        render_simulator(industry, catalog()[industry], _industry_view(industry))
+
+# Everything that depends on the selected industry lives in one fragment, so
+# changing the selection reruns only this block and not the static sections below
+@st.fragment
+def render_industry_view():
+    # Industry selection
+    st.subheader("🏭 Select Industry for Analysis")
+    selected_industry = st.selectbox(
+        "Choose an industry to explore its cross-sectoral dependencies:",
+        _industry_names(),
+        key="selected_industry",
+        help="Based on CDP's analysis of corporate disclosures and SBTi guidance coverage"
+    )
+
+    record = catalog()[selected_industry]
+    view = _industry_view(selected_industry)
+    
+    st.subheader(f"📊 Cross-Sectoral Dependencies: {selected_industry}")
+    
+    st.plotly_chart(
+        view['dependency_figure'],
+        use_container_width=True,
+        config=PLOTLY_CONFIG,
+        theme=None
+    )
+
+    # Main dashboard layout
+    col1, col2 = st.columns([3, 2])
+
+    with col1:
+        # Guidance coverage summary
+        st.markdown("### 📋 Guidance Coverage Analysis")
+        
+        st.dataframe(
+            view['guidance_df'],
+            use_container_width=True,
+            hide_index=True,
+            column_config=GUIDANCE_COLUMN_CONFIG
+        )
+
+    with col2:
+        st.subheader("🎯 The Guidance Inadequacy Problem")
+        
+        # Key insights
+        st.markdown(f"""
+        **Key Challenge:**
+        {record.key_challenge}
+        
+        **Sample Size:** {record.cdp_sample_size} companies (CDP 2021)
+        
+        **Main Gap:** {record.main_gap}
+        """)
+
+    render_cost_analysis()
+
+render_industry_view()
+
 # Key insights and conclusions
 st.subheader("🔑 Why Current Approaches Fail")
 